@@ -1,6 +1,9 @@
 ## This script is built to move the pitch and yaw of the neck based on object recognition key points in a parallel script. 
 ## this can be used as an example, and you can implement your own control by modifying the move() function to accept as many inouts as you want.
 ## Refer to the readme for accepted serial commands: command = f"H30,X0,P0,S1,A1" ~ moves all actuators up 30mm
+import atexit
+import collections
+import threading
 import serial
 import time
 import bluetooth
@@ -32,8 +35,26 @@ def bluetooth_connect(device_address, port):
         return None
 
 # Open serial connection
-def serial_connect(port, baudrate):
-    return serial.Serial(port, baudrate)
+def serial_connect(port, baudrate, connect_timeout=5.0, retry_interval=0.5):
+    # The USB adapter can take a few seconds to enumerate, so keep retrying
+    # until connect_timeout runs out (always at least one attempt)
+    deadline = time.monotonic() + connect_timeout
+    while True:
+        try:
+            ser = serial.Serial(port, baudrate)
+            break
+        except serial.SerialException as e:
+            if time.monotonic() >= deadline:
+                raise
+            print(f"Serial connection failed, retrying: {e}")
+            time.sleep(retry_interval)
+    # Have the driver push small writes out immediately instead of waiting
+    # on the USB latency timer (16 ms by default on FTDI), Linux only
+    try:
+        ser.set_low_latency_mode(True)
+    except (AttributeError, NotImplementedError, ValueError) as e:
+        print(f"Low latency mode unavailable: {e}")
+    return ser
 
 device_address = "7C:9E:BD:F0:92:A4"
 port = 1
@@ -48,17 +69,72 @@ else:
     print("Falling back to serial connection")
     ser = serial_connect('/dev/ttyUSB0', 115200)
 
+# Commands queued by move() are written out by a background thread,
+# so the caller never blocks waiting on the port to drain.
+# Every command carries the full H/X/P set, so a newer one supersedes
+# anything still waiting and only the latest is kept
+command_queue = collections.deque(maxlen=1)
+command_ready = threading.Event()
+last_command = None
+# Set when a write fails, move() reports it so a dead link isn't silent
+writer_error = None
+# Set at exit, the writer sends what is still pending and then stops
+closing = False
+
+def serial_writer():
+    global last_command, writer_error
+    while True:
+        if closing and not command_queue:
+            return
+        command_ready.wait()
+        command_ready.clear()
+        try:
+            command = command_queue.popleft()
+        except IndexError:
+            continue
+        # Skip repeats of the command sent just before
+        if command != last_command:
+            try:
+                ser.write(command)
+            except Exception as e:
+                # Unplugged adapter, closed socket, etc. Stop writing and
+                # hand the error to the next move() call
+                writer_error = e
+                return
+            last_command = command
+
+writer_thread = threading.Thread(target=serial_writer, daemon=True)
+writer_thread.start()
+
+# Flush the last pending command (e.g. a final re-centering move()) and
+# release the port when the calling script exits
+def close_connection():
+    global closing
+    closing = True
+    command_ready.set()
+    writer_thread.join(timeout=1.0)
+    # If the writer is still stuck in a write, leave the port for the OS to
+    # release on exit rather than closing it under that write
+    if not writer_thread.is_alive():
+        ser.close()
+
+atexit.register(close_connection)
+
 prev_x = center_x
 prev_y = center_y
-prev_time = time.time()
+prev_time = time.monotonic()
 
 def move(x, y):
     global prev_x, prev_y, prev_time
 
+    if writer_error is not None:
+        raise serial.SerialException("serial writer stopped") from writer_error
+
     x_delta = 0
     p_delta = 0
-    current_time = time.time()
-    time_delta = current_time - prev_time
+    # Monotonic so a wall clock step can't give a zero or negative delta
+    current_time = time.monotonic()
+    time_delta = max(current_time - prev_time, 1e-6)
 
     # Adjust the deltas based on the position
     if y > center_y + delta_threshold_y:
@@ -90,7 +166,9 @@ def move(x, y):
     p_delta_normalized = -1.2 * p_delta_constrained
     x_delta_normalized = -1.5 * x_delta_constrained
 
-    # Send the command
-    command = f"H30,X{x_delta_normalized},P{p_delta_normalized}, \n"
-    print(command)
-    ser.write(command.encode())
+    # Send the command, built directly as bytes since the protocol is plain ASCII
+    command = b"H30,X%.2f,P%.2f, \n" % (x_delta_normalized, p_delta_normalized)
+    print(command.decode(), end="")
+    # If the port is falling behind, this replaces the pending command
+    command_queue.append(command)
+    command_ready.set()